@@ -5,6 +5,8 @@
 """
 
 import os
+import shutil
+import tempfile
 import requests
 from typing import Callable, Dict, Union
 from pathlib import Path
@@ -13,6 +15,7 @@ import uuid
 
 class DocumentConverter:
     _converters: Dict[str, Callable] = {}
+    _stream_converters: Dict[str, Callable] = {}
     _registered_types: Dict[str, Dict[str, Callable]] = {}
 
     @classmethod
@@ -25,6 +28,16 @@ class DocumentConverter:
         """
         cls._converters[converter_name.lower()] = converter_func
 
+    @classmethod
+    def register_stream(cls, converter_name: str, converter_func: Callable):
+        """注册转换器的内存流版本，URL转换时直接解析下载到内存的内容，无需写入临时文件
+
+        Args:
+            converter_name: 转换器名称，需与register时使用的名称一致
+            converter_func: 转换函数，接收二进制文件对象，返回值与文件路径版本相同
+        """
+        cls._stream_converters[converter_name.lower()] = converter_func
+
     @classmethod
     def convert_to_text(
         cls, file_path: Union[str, Path], converter_name: str = "markitdown", **kwargs
@@ -73,38 +86,56 @@ class DocumentConverter:
             Exception: 如果URL下载或转换失败
         """
         try:
-            # 下载文件
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-
-            # 检查内容类型
-            content_type = response.headers.get("content-type", "")
-            # 这里可能存在问题：如果服务器没有正确设置content-type或者返回了其他类型的PDF文件
-            # 可以考虑检查URL是否以.pdf结尾或者使用更宽松的检查方式
-            if "application/pdf" not in content_type.lower() and not url.lower().endswith(".pdf"):
-                raise ValueError(f"URL必须指向PDF文件，当前内容类型: {content_type}")
-
-            # 创建临时文件
-            os.makedirs("temp", exist_ok=True)
-            temp_path = os.path.join("temp", f"{uuid.uuid4()}.pdf")
-
-            with open(temp_path, "wb") as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        temp_file.write(chunk)
-
-            # 检查下载的文件是否为空
-            if os.path.getsize(temp_path) == 0:
-                raise ValueError("下载的文件为空")
-
-            # 转换文件
+            # 转换器支持内存流时直接在内存中解析，否则下载到临时文件
+            stream_converter = cls._stream_converters.get(converter_name.lower())
+            temp_path = None
+            buffer = None
             try:
-                result = cls.convert_to_text(temp_path, converter_name=converter_name, **kwargs)
+                # 下载文件；with块结束时立即释放连接，不必等到转换完成。
+                # 超时作用于建连和每次读取，服务端停止响应时不会无限等待
+                with requests.get(url, stream=True, timeout=(5, 30)) as response:
+                    response.raise_for_status()
+
+                    # 检查内容类型
+                    content_type = response.headers.get("content-type", "")
+                    # 这里可能存在问题：如果服务器没有正确设置content-type或者返回了其他类型的PDF文件
+                    # 可以考虑检查URL是否以.pdf结尾或者使用更宽松的检查方式
+                    if "application/pdf" not in content_type.lower() and not url.lower().endswith(
+                        ".pdf"
+                    ):
+                        raise ValueError(f"URL必须指向PDF文件，当前内容类型: {content_type}")
+
+                    # 以1MB缓冲区直接从底层连接拷贝，按需解压gzip等传输编码
+                    response.raw.decode_content = True
+                    if stream_converter:
+                        # 16MB以内的文件留在内存中，超出时自动落盘，避免大文件占满内存
+                        buffer = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+                        shutil.copyfileobj(response.raw, buffer, length=1024 * 1024)
+                        size = buffer.tell()
+                    else:
+                        os.makedirs("temp", exist_ok=True)
+                        temp_path = os.path.join("temp", f"{uuid.uuid4().hex}.pdf")
+                        with open(temp_path, "wb") as temp_file:
+                            shutil.copyfileobj(response.raw, temp_file, length=1024 * 1024)
+                        size = os.path.getsize(temp_path)
+
+                # 检查下载的文件是否为空
+                if size == 0:
+                    raise ValueError("下载的文件为空")
+
+                # 转换文件
+                if stream_converter:
+                    buffer.seek(0)
+                    result = stream_converter(buffer, **kwargs)
+                else:
+                    result = cls.convert_to_text(temp_path, converter_name=converter_name, **kwargs)
                 result["url"] = url
                 return result
             finally:
-                # 清理临时文件
-                if os.path.exists(temp_path):
+                # 清理临时文件，下载中途失败时同样清理
+                if buffer is not None:
+                    buffer.close()
+                if temp_path and os.path.exists(temp_path):
                     os.unlink(temp_path)
 
         except requests.exceptions.RequestException as e:
@@ -4,37 +4,57 @@
 新的转换器应该在这里注册。
 """
 
+import importlib.util
 from pathlib import Path
 from typing import Dict, Any, Optional
 from .document_converter import DocumentConverter
 
 # 导入所有转换器
+# 各转换器模块都在函数内部才导入重量级依赖，
+# 因此需要单独检查依赖是否已安装
 try:
     from tools.everything_to_text.pdf_to_md_mineru import mineru_pdf2md
 
-    _has_mineru = True
+    _has_mineru = importlib.util.find_spec("magic_pdf") is not None
 except ImportError:
     _has_mineru = False
 
 try:
-    from tools.everything_to_text.pdf_to_md_markitdown import markitdown_pdf2md
+    from tools.everything_to_text.pdf_to_md_markitdown import (
+        markitdown_pdf2md,
+        markitdown_pdf2md_stream,
+    )
 
-    _has_markitdown = True
+    _has_markitdown = importlib.util.find_spec("markitdown") is not None
 except ImportError:
     _has_markitdown = False
 
+try:
+    from tools.everything_to_text.pdf_to_md_pdfium import pdfium_pdf2md, pdfium_pdf2md_stream
+
+    _has_pdfium = importlib.util.find_spec("pypdfium2") is not None
+except ImportError:
+    _has_pdfium = False
+
 
 def register_all_converters():
     """注册所有可用的转换器"""
     # 注册 MarkItDown 转换器（作为默认PDF转换器）
     if _has_markitdown:
         DocumentConverter.register("markitdown", markitdown_pdf2md)
+        DocumentConverter.register_stream("markitdown", markitdown_pdf2md_stream)
 
     # 注册 Mineru 转换器
     if _has_mineru:
         DocumentConverter.register("mineru", mineru_pdf2md)
 
+    # 注册 pypdfium2 转换器（仅提取纯文本，速度最快）
+    if _has_pdfium:
+        DocumentConverter.register("pdfium", pdfium_pdf2md)
+        DocumentConverter.register_stream("pdfium", pdfium_pdf2md_stream)
+
     # 在这里添加更多转换器的注册...
+    # 能直接解析内存数据的转换器可额外通过register_stream注册，URL转换时免去临时文件
 
 
 # 在模块导入时自动注册所有转换器
@@ -1,14 +1,26 @@
 import os
+import json
+import random
+import re
+import shutil
+import time
 from typing import Dict, List, Optional, Generator
 import yaml
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 
 from core.llm_wrapper import LLMWrapper
 from core.document_converter import convert_to_text
 from utils.output_formatter import OutputFormatter
 from loguru import logger
 
+# 下载时需要重试的HTTP状态码
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 匹配只包含空白字符的行（连同其换行符）
+_BLANK_LINE_RE = re.compile(r"^[^\S\n]*(?:\n|\Z)", re.MULTILINE)
+
 
 class SmartPaper:
     """论文阅读和存档工具"""
@@ -40,6 +52,23 @@ class SmartPaper:
         # 设置输出格式
         self.output_format = output_format
 
+        # 复用连接的HTTP会话，多次下载同一站点时免去重复的TCP/TLS握手
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "SmartPaper"
+
+    def close(self):
+        """关闭HTTP会话，释放连接池"""
+        self.session.close()
+
+    def __enter__(self) -> "SmartPaper":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _load_config(self, config_file: str) -> Dict:
         """加载配置文件
 
@@ -142,16 +171,25 @@ class SmartPaper:
                 if not arxiv_id.endswith(".pdf"):
                     arxiv_id += ".pdf"
                 temp_path = os.path.join(temp_dir, arxiv_id)
+                cache_path = os.path.join(temp_dir, f"{Path(arxiv_id).stem}.md.json")
+
+                # 论文未变化时直接复用上次的转换结果，跳过下载和转换
+                etag = self._fetch_etag(url)
+                result = self._load_cached_conversion(cache_path, etag, converter_name, temp_path)
+                if result is not None:
+                    logger.info(f"使用缓存的转换结果: {cache_path}")
+                    return self._finalize_arxiv_result(result, url, description)
 
                 # 下载PDF文件
                 logger.info(f"开始下载PDF: {url}")
                 try:
-                    response = requests.get(url, timeout=30)  # 设置超时
-                    response.raise_for_status()
-
-                    # 保存到临时目录
-                    with open(temp_path, "wb") as f:
-                        f.write(response.content)
+                    # 流式写入临时目录，避免整个PDF驻留内存；禁用压缩以免运行时解压
+                    with self._get_with_retry(
+                        url, stream=True, headers={"Accept-Encoding": "identity"}
+                    ) as response:
+                        response.raw.decode_content = True
+                        with open(temp_path, "wb") as f:
+                            shutil.copyfileobj(response.raw, f, length=1 << 20)
                     logger.info("PDF下载完成")
                 except Exception as e:
                     raise Exception(f"下载PDF失败: {str(e)}")
@@ -161,21 +199,9 @@ class SmartPaper:
                     temp_path, config=self.config, converter_name=converter_name
                 )
                 logger.info(f"PDF转换完成，使用转换器: {converter_name}")
+                self._save_cached_conversion(cache_path, etag, converter_name, result)
 
-                # 处理文本内容
-                text_content = result["text_content"]
-                if "References" in text_content:
-                    text_content = text_content.split("References")[0]
-                text_content = "\n".join(
-                    [line for line in text_content.split("\n") if line.strip()]
-                )
-
-                # 更新结果
-                result["text_content"] = text_content
-                result["metadata"]["url"] = url
-                if description:
-                    result["metadata"]["description"] = description
-                return result
+                return self._finalize_arxiv_result(result, url, description)
 
             else:
                 # 创建temp目录用于处理当前请求
@@ -184,17 +210,15 @@ class SmartPaper:
                 )
                 os.makedirs(temp_dir, exist_ok=True)
 
-                # 获取网页内容
-                response = requests.get(url)
-                response.raise_for_status()
-
                 # 确定文件名和路径
                 file_suffix = ".html"  # 假设默认为html，可以根据content-type改进
                 temp_path = os.path.join(temp_dir, f"downloaded_content{file_suffix}")
 
-                # 保存内容到临时文件
-                with open(temp_path, "wb") as temp_file:
-                    temp_file.write(response.content)
+                # 获取网页内容并流式保存到临时文件
+                with self._get_with_retry(url, stream=True) as response:
+                    with open(temp_path, "wb") as temp_file:
+                        for chunk in response.iter_content(chunk_size=1 << 16):
+                            temp_file.write(chunk)
 
                 # 转换HTML文件
                 result = convert_to_text(
@@ -213,6 +237,155 @@ class SmartPaper:
         except Exception as e:
             raise Exception(f"URL转换失败: {str(e)}")
 
+    def _get_with_retry(self, url: str, **kwargs) -> requests.Response:
+        """发送GET请求，遇到连接错误、超时或429/5xx时按带抖动的指数退避重试
+
+        重试次数和最长等待时间分别由配置项document_converter.download_max_retries
+        （默认3）和document_converter.download_max_backoff（默认30秒）控制。
+
+        Args:
+            url (str): 请求URL
+            **kwargs: 传递给session.get的其他参数
+
+        Returns:
+            requests.Response: 状态码正常的响应
+
+        Raises:
+            requests.exceptions.RequestException: 重试耗尽后仍然失败
+        """
+        converter_config = self.config.get("document_converter", {})
+        max_retries = converter_config.get("download_max_retries", 3)
+        max_backoff = converter_config.get("download_max_backoff", 30)
+        kwargs.setdefault("timeout", (5, 30))
+
+        for attempt in range(max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == max_retries:
+                    raise
+                reason = str(e)
+            else:
+                if response.status_code not in _RETRY_STATUS_CODES or attempt == max_retries:
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.HTTPError:
+                        # 不再重试时调用方拿不到响应，需在此释放连接
+                        response.close()
+                        raise
+                    return response
+                reason = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+
+            wait = min(max_backoff, 2**attempt) * (0.5 + random.random())
+            if retry_after and retry_after.isdigit():
+                wait = min(max_backoff, int(retry_after))
+            logger.warning(f"请求失败（{reason}），{wait:.1f}秒后重试: {url}")
+            time.sleep(wait)
+
+    @staticmethod
+    def _finalize_arxiv_result(result: Dict, url: str, description: Optional[str]) -> Dict:
+        """去除参考文献和空行，并补充URL、描述等元数据
+
+        Args:
+            result (Dict): 转换结果
+            url (str): 论文URL
+            description (Optional[str]): 论文描述
+
+        Returns:
+            Dict: 处理后的结果
+        """
+        # 处理文本内容
+        text_content = result["text_content"]
+        references_index = text_content.find("References")
+        if references_index != -1:
+            text_content = text_content[:references_index]
+        text_content = _BLANK_LINE_RE.sub("", text_content).rstrip("\n")
+
+        # 更新结果
+        result["text_content"] = text_content
+        result["metadata"]["url"] = url
+        if description:
+            result["metadata"]["description"] = description
+        return result
+
+    def _fetch_etag(self, url: str) -> Optional[str]:
+        """通过HEAD请求获取资源的ETag，服务端未提供时退回Last-Modified
+
+        Args:
+            url (str): 资源URL
+
+        Returns:
+            Optional[str]: ETag，获取失败时返回None
+        """
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=(5, 10))
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"获取ETag失败: {url}, {e}")
+            return None
+        return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+    @staticmethod
+    def _load_cached_conversion(
+        cache_path: str, etag: Optional[str], converter_name: str, pdf_path: str
+    ) -> Optional[Dict]:
+        """读取磁盘上的转换缓存
+
+        能获取到ETag时，ETag和转换器都一致才命中；获取不到ETag（如离线）时，
+        只要缓存比本地已下载的PDF新且转换器一致即视为命中。
+
+        Args:
+            cache_path (str): 缓存文件路径
+            etag (Optional[str]): 当前资源的ETag
+            converter_name (str): 转换器名称
+            pdf_path (str): 本地已下载的PDF路径
+
+        Returns:
+            Optional[Dict]: 缓存的转换结果，未命中时返回None
+        """
+        try:
+            if etag is None and os.path.getmtime(cache_path) < os.path.getmtime(pdf_path):
+                return None
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("converter_name") != converter_name:
+            return None
+        if etag is not None and cached.get("etag") != etag:
+            return None
+        return {"text_content": cached["text_content"], "metadata": cached["metadata"]}
+
+    @staticmethod
+    def _save_cached_conversion(
+        cache_path: str, etag: Optional[str], converter_name: str, result: Dict
+    ):
+        """将转换结果写入磁盘缓存
+
+        Args:
+            cache_path (str): 缓存文件路径
+            etag (Optional[str]): 资源的ETag
+            converter_name (str): 转换器名称
+            result (Dict): 转换结果
+        """
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "etag": etag,
+                        "converter_name": converter_name,
+                        "text_content": result["text_content"],
+                        "metadata": result.get("metadata", {}),
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+        except (OSError, TypeError) as e:
+            logger.warning(f"写入转换缓存失败: {cache_path}, {e}")
+
     def process_paper_url(
         self,
         url: str,
@@ -23,50 +23,65 @@
 - 支持多种图像格式（PNG、JPG、TIFF等）
 """
 
-from openai import OpenAI
+from openai import APIConnectionError, APITimeoutError, OpenAI
 from dotenv import load_dotenv
+import httpx
 import os
 import base64
-from typing import Any, Dict
+import hashlib
+import io
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List
 from pathlib import Path
-from PIL import Image
 from loguru import logger
 
+# .env 只需在模块导入时加载一次，避免每次实例化时重复解析
+load_dotenv()
 
-class ImageTextExtractor:
-    """图像文本提取器类，用于将图像内容转换为文本或Markdown格式。"""
+# 流式读取过程中可重试的网络错误
+_RETRYABLE_STREAM_ERRORS = (APIConnectionError, APITimeoutError, httpx.TransportError)
 
-    def __init__(
-        self,
-        api_key: str = None,
-        base_url: str = "https://api.siliconflow.cn/v1",
-        prompt: str | None = None,
-        prompt_path: str | None = None,
-    ):
-        """
-        初始化ImageTextExtractor实例。
+# 无法通过魔数识别时可接受的图像文件后缀及其MIME子类型
+_IMAGE_SUFFIXES: Dict[str, str] = {
+    "png": "png",
+    "jpg": "jpeg",
+    "jpeg": "jpeg",
+    "gif": "gif",
+    "webp": "webp",
+    "tif": "tiff",
+    "tiff": "tiff",
+    "bmp": "bmp",
+}
 
-        Args:
-            api_key (str): API密钥，如果未提供则从环境变量中读取
-            base_url (str): API基础URL
-            prompt (str): 提示文本
-            prompt_path (str): 提示文本文件路径
-        """
-        load_dotenv()
-        self.api_key: str = api_key or os.getenv("API_KEY")
+# 标准Base64字符串（含可选的末尾填充）
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]+={0,2}")
 
-        if not self.api_key:
-            raise ValueError("API key is required")
+# 匹配```markdown（或```md）代码块，缺少结束标记时取到文本末尾
+_MARKDOWN_FENCE_RE = re.compile(r"```(?:markdown|md)\b(.*?)(?:```|\Z)", re.DOTALL | re.IGNORECASE)
 
-        self.client: OpenAI = OpenAI(
-            api_key=self.api_key,
-            base_url=base_url,
-        )
-        self._prompt: str = (
-            prompt or self._read_prompt(prompt_path)
-            if prompt_path
-            else None
-            or """
+# 描述图像时本地图像最长边的像素上限；OCR需要保留小字细节，不缩放
+_DESCRIBE_MAX_EDGE = 1024
+
+# describe_image等图像描述函数默认的最大生成token数，简短描述即可满足需要
+_DESCRIBE_MAX_TOKENS = 200
+
+# 分块Base64编码时每次读取的字节数，须为3的整数倍
+_B64_CHUNK_SIZE = 57 * 1024
+
+# 常见图像格式对应的data URL前缀，避免每次调用时重复拼接
+_DATA_URL_PREFIXES: Dict[str, bytes] = {
+    ext: f"data:image/{ext};base64,".encode("ascii")
+    for ext in ("png", "jpeg", "tiff", "gif", "webp", "bmp")
+}
+
+
+# 未指定prompt和prompt_path时使用的默认提示
+_DEFAULT_PROMPT = """
 # OCR图像到Markdown转换提示
 
 ## 任务
@@ -96,7 +111,59 @@ class ImageTextExtractor:
     更多文本和内容...
     ```
             """
+
+
+class ImageTextExtractor:
+    """图像文本提取器类，用于将图像内容转换为文本或Markdown格式。"""
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "https://api.siliconflow.cn/v1",
+        prompt: str | None = None,
+        prompt_path: str | None = None,
+        timeout: float = 120.0,
+        max_retries: int = 5,
+        cache_size: int = 128,
+    ):
+        """
+        初始化ImageTextExtractor实例。
+
+        Args:
+            api_key (str): API密钥，如果未提供则从环境变量中读取
+            base_url (str): API基础URL
+            prompt (str): 提示文本
+            prompt_path (str): 提示文本文件路径
+            timeout (float): 单次请求读写阶段的超时时间（秒），建连超时固定为5秒
+            max_retries (int): 遇到限流、连接错误或超时时的最大重试次数，
+                重试间隔为带抖动的指数退避，并会遵循服务端返回的Retry-After
+            cache_size (int): 按图像内容缓存提取结果的最大条目数，为0时不缓存
+        """
+        self.api_key: str = api_key or os.getenv("API_KEY")
+
+        if not self.api_key:
+            raise ValueError("API key is required")
+
+        self.max_retries: int = max_retries
+        self.client: OpenAI = OpenAI(
+            api_key=self.api_key,
+            base_url=base_url,
+            max_retries=max_retries,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=_build_timeout(timeout),
+            ),
         )
+        self.cache_size: int = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        # 共享实例会被多个线程同时使用（如批量描述图片），缓存读写需要加锁
+        self._cache_lock = threading.Lock()
+        if prompt:
+            self._prompt: str = prompt
+        elif prompt_path:
+            self._prompt = self._read_prompt(prompt_path)
+        else:
+            self._prompt = _DEFAULT_PROMPT
 
     def _read_prompt(self, prompt_path: str) -> str:
         """
@@ -110,8 +177,8 @@ class ImageTextExtractor:
         """
         if not prompt_path.endswith((".md", ".txt")):
             raise ValueError("Prompt file must be a .md or .txt file")
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            return f.read()
+        abs_path = os.path.abspath(prompt_path)
+        return _read_prompt_file(abs_path, os.stat(abs_path).st_mtime_ns)
 
     def extract_image_text(
         self,
@@ -122,6 +189,9 @@ class ImageTextExtractor:
         prompt: str = None,
         temperature: float = 0.1,
         top_p: float = 0.5,
+        stream: bool = False,
+        max_edge: int = 0,
+        max_tokens: int | None = None,
     ) -> str:
         """
         提取图像中的文本并转换为Markdown格式。
@@ -134,10 +204,125 @@ class ImageTextExtractor:
             prompt (str): 提示文本
             temperature (float): 生成文本的温度参数
             top_p (float): 生成文本的top_p参数
+            stream (bool): 是否使用流式请求，默认关闭；结果总是在完整生成后一次性返回，
+                仅在需要边生成边读取的场景下开启
+            max_edge (int): 本地图像最长边的像素上限，超出时先等比缩小再编码；
+                默认为0，即不缩放
+            max_tokens (int): 生成文本的最大token数，默认不限制；生成耗时与输出长度成正比，
+                只需简短结果时设置该值可明显缩短耗时
 
         Returns:
             str: 提取的Markdown格式文本
         """
+        request = self._build_request(
+            image_url,
+            local_image_path,
+            model,
+            detail,
+            prompt,
+            temperature,
+            top_p,
+            stream,
+            max_edge,
+            max_tokens,
+        )
+        cache_key = self._cache_key(request)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._request_text(request)
+        self._cache_put(cache_key, result)
+        return result
+
+    def _request_text(self, request: Dict[str, Any]) -> str:
+        """发送请求并返回完整的响应文本。"""
+        try:
+            # 建立请求时的失败由客户端自身重试；这里只补充流式读取中途断开时的整体重试
+            for attempt in range(self.max_retries + 1):
+                response = self.client.chat.completions.create(**request)
+
+                if not request["stream"]:
+                    return response.choices[0].message.content or ""
+
+                try:
+                    parts: List[str] = []
+                    append = parts.append
+                    for chunk in response:
+                        chunk_message: str | None = chunk.choices[0].delta.content
+                        if chunk_message:
+                            append(chunk_message)
+                    return "".join(parts)
+                except _RETRYABLE_STREAM_ERRORS as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = _backoff_delay(attempt)
+                    logger.warning(f"流式响应中断，{delay:.1f}秒后重试: {e}")
+                    time.sleep(delay)
+        except Exception as e:
+            raise RuntimeError(f"Failed to extract text from image: {e}") from e
+
+    def _cache_key(self, request: Dict[str, Any]) -> str:
+        """
+        根据图像内容、模型、细节级别和提示文本计算结果缓存的键。
+
+        Args:
+            request (Dict[str, Any]): _build_request构造的请求参数
+
+        Returns:
+            str: 缓存键
+        """
+        content = request["messages"][0]["content"]
+        image_url = content[0]["image_url"]
+        key = hashlib.blake2b(digest_size=16)
+        for part in (
+            image_url["url"],
+            image_url["detail"],
+            content[1]["text"],
+            request["model"],
+            f"{request['temperature']}:{request['top_p']}:{request.get('max_tokens')}",
+        ):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def _cache_get(self, cache_key: str) -> str | None:
+        """读取缓存结果，命中时将其标记为最近使用。"""
+        with self._cache_lock:
+            result = self._cache.get(cache_key)
+            if result is not None:
+                self._cache.move_to_end(cache_key)
+            return result
+
+    def _cache_put(self, cache_key: str, result: str):
+        """写入缓存结果，超出容量时淘汰最久未使用的条目。"""
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _build_request(
+        self,
+        image_url: str | None,
+        local_image_path: str | None,
+        model: str,
+        detail: str,
+        prompt: str | None,
+        temperature: float,
+        top_p: float,
+        stream: bool,
+        max_edge: int,
+        max_tokens: int | None = None,
+    ) -> Dict[str, Any]:
+        """
+        校验参数并构造chat.completions.create的请求参数。
+
+        Returns:
+            Dict[str, Any]: 请求参数字典
+        """
         if not image_url and not local_image_path:
             raise ValueError("Either image_url or local_image_path is required")
 
@@ -148,49 +333,41 @@ class ImageTextExtractor:
         ):
             raise ValueError("Image URL must be a valid HTTP/HTTPS URL or a Base64 encoded string")
 
-        if local_image_path:
-            if not os.path.exists(local_image_path):
-                raise FileNotFoundError(f"The file {local_image_path} does not exist.")
-            image_extension: str = self._get_image_extension(local_image_path)
-            with open(local_image_path, "rb") as image_file:
-                base64_image: str = base64.b64encode(image_file.read()).decode("utf-8")
-                image_url = f"data:image/{image_extension};base64,{base64_image}"
-
         if detail not in ["low", "high", "auto"]:
             raise ValueError("Invalid detail value. Allowed values are 'low', 'high', 'auto'")
 
         if detail == "auto":
             detail = "low"
 
+        if local_image_path:
+            try:
+                image_url = _prepare_data_url(local_image_path, max_edge)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"The file {local_image_path} does not exist.")
+
         prompt = prompt or self._prompt
 
-        try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": image_url, "detail": detail},
-                            },
-                            {"type": "text", "text": prompt},
-                        ],
-                    }
-                ],
-                stream=True,
-                temperature=temperature,
-                top_p=top_p,
-            )
-
-            result: str = ""
-            for chunk in response:
-                chunk_message: str = chunk.choices[0].delta.content
-                result += chunk_message
-            return result
-        except Exception as e:
-            raise RuntimeError(f"Failed to extract text from image: {e}")
+        request = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": image_url, "detail": detail},
+                        },
+                        {"type": "text", "text": prompt},
+                    ],
+                }
+            ],
+            "stream": stream,
+            "temperature": temperature,
+            "top_p": top_p,
+        }
+        if max_tokens:
+            request["max_tokens"] = max_tokens
+        return request
 
     def _is_base64(self, s: str) -> bool:
         """
@@ -202,30 +379,234 @@ class ImageTextExtractor:
         Returns:
             bool: 如果是Base64编码则返回True，否则返回False
         """
-        try:
-            if isinstance(s, str):
-                if s.strip().startswith("data:image"):
-                    return True
-                return base64.b64encode(base64.b64decode(s)).decode("utf-8") == s
-            return False
-        except Exception:
+        if not isinstance(s, str):
             return False
+        if s.strip().startswith("data:image"):
+            return True
+        return len(s) >= 16 and len(s) % 4 == 0 and _BASE64_RE.fullmatch(s) is not None
 
-    def _get_image_extension(self, file_path: str) -> str:
+    @staticmethod
+    def _get_image_extension(file_path: str, head: bytes | None = None) -> str:
         """
         获取图像文件的扩展名。
 
+        优先读取文件头的魔数判断格式，无法识别时退回使用文件后缀，后缀也不是已知的
+        图像格式时报错。
+
         Args:
             file_path (str): 图像文件路径
+            head (bytes): 已读取的文件开头字节，提供时不再重新打开文件
 
         Returns:
             str: 图像文件的扩展名
         """
-        try:
-            with Image.open(file_path) as img:
-                return img.format.lower()
-        except Exception as e:
-            raise ValueError(f"Failed to determine image format: {e}")
+        if head is None:
+            try:
+                with open(file_path, "rb") as image_file:
+                    head = image_file.read(12)
+            except Exception as e:
+                raise ValueError(f"Failed to determine image format: {e}")
+        image_extension = _sniff_image_extension(head)
+        if image_extension:
+            return image_extension
+
+        suffix = Path(file_path).suffix.lstrip(".").lower()
+        image_extension = _IMAGE_SUFFIXES.get(suffix)
+        if image_extension is None:
+            raise ValueError(f"Failed to determine image format: {file_path}")
+        return image_extension
+
+
+def _sniff_image_extension(head: bytes) -> str | None:
+    """
+    根据文件头的魔数识别常见图像格式。
+
+    Args:
+        head (bytes): 文件开头至少12个字节
+
+    Returns:
+        str | None: 识别出的扩展名，无法识别时返回None
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    if head.startswith(b"BM"):
+        return "bmp"
+    return None
+
+
+@lru_cache(maxsize=16)
+def _read_prompt_file(abs_path: str, mtime_ns: int) -> str:
+    """
+    读取提示文件，以(路径, 修改时间)为键缓存，文件修改后自动重新读取。
+
+    Args:
+        abs_path (str): 提示文件的绝对路径
+        mtime_ns (int): 文件修改时间（纳秒），仅用作缓存键
+
+    Returns:
+        str: 提示文本内容
+    """
+    with open(abs_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _get_extractor(api_key: str | None) -> ImageTextExtractor:
+    """
+    获取共享的ImageTextExtractor实例。
+
+    只按API密钥区分实例，提示文本在每次调用时传入，因此不同提示的调用共用同一个实例及其
+    HTTP连接池。密钥数量很少，实例不会被淘汰，也就不存在未关闭的客户端。
+
+    Args:
+        api_key (str): API密钥
+
+    Returns:
+        ImageTextExtractor: 提取器实例
+    """
+    return ImageTextExtractor(api_key=api_key)
+
+
+def _resolve_prompt(
+    extractor: ImageTextExtractor, prompt: str | None, prompt_path: str | None
+) -> str | None:
+    """
+    确定本次调用使用的提示文本。
+
+    Args:
+        extractor (ImageTextExtractor): 提取器实例
+        prompt (str): 提示文本，优先使用
+        prompt_path (str): 提示文本文件路径，按修改时间缓存读取结果
+
+    Returns:
+        str | None: 提示文本，均未指定时返回None以使用提取器的默认提示
+    """
+    if prompt:
+        return prompt
+    if prompt_path:
+        return extractor._read_prompt(prompt_path)
+    return None
+
+
+def _build_timeout(timeout: float) -> httpx.Timeout:
+    """
+    构造分阶段的请求超时。
+
+    建连和从连接池获取连接应当很快完成，使用较短的超时以便尽早失败并交给重试；
+    读写阶段包含模型推理时间，使用调用方指定的超时。
+
+    Args:
+        timeout (float): 读写阶段的超时时间（秒）
+
+    Returns:
+        httpx.Timeout: 超时配置
+    """
+    return httpx.Timeout(timeout, connect=5.0, pool=5.0)
+
+
+def _backoff_delay(attempt: int, max_delay: float = 30.0) -> float:
+    """
+    计算带完全抖动的指数退避时间。
+
+    Args:
+        attempt (int): 已失败的次数（从0开始）
+        max_delay (float): 退避时间上限（秒）
+
+    Returns:
+        float: 本次需要等待的秒数
+    """
+    return random.uniform(0, min(max_delay, 2.0**attempt))
+
+
+def _prepare_data_url(local_image_path: str, max_edge: int = 0) -> str:
+    """
+    将本地图像文件编码为data URL。
+
+    Args:
+        local_image_path (str): 本地图像文件路径
+        max_edge (int): 最长边的像素上限，超出时先等比缩小再编码，为0时不缩放
+
+    Returns:
+        str: data:image/<ext>;base64,... 格式的字符串
+    """
+    # 只打开一次文件：首块数据同时用于识别格式和编码，需要缩放时复用同一文件对象
+    with open(local_image_path, "rb") as image_file:
+        if max_edge:
+            downscaled = _downscale_image(image_file, max_edge)
+            if downscaled is not None:
+                image_extension, image_bytes = downscaled
+                prefix = _DATA_URL_PREFIXES[image_extension]
+                return (prefix + base64.b64encode(image_bytes)).decode("ascii")
+            image_file.seek(0)
+
+        first_chunk = image_file.read(_B64_CHUNK_SIZE)
+        image_extension: str = ImageTextExtractor._get_image_extension(
+            local_image_path, first_chunk[:12]
+        )
+        prefix: bytes = _DATA_URL_PREFIXES.get(image_extension) or (
+            f"data:image/{image_extension};base64,".encode("ascii")
+        )
+        data_url = bytearray(prefix)
+        data_url += base64.b64encode(first_chunk)
+        _b64encode_into(image_file, data_url)
+    return data_url.decode("ascii")
+
+
+def _downscale_image(image_file, max_edge: int) -> tuple[str, bytes] | None:
+    """
+    将最长边超过max_edge的图像等比缩小。
+
+    视觉模型在服务端同样会把大图缩小后再推理，提前在本地缩小可以减少上传体积、
+    Base64编码开销和图像token数。PNG、GIF及带透明通道的图像保存为PNG以保留线条细节，
+    其余保存为质量90的JPEG。
+
+    Args:
+        image_file: 以二进制模式打开的图像文件对象
+        max_edge (int): 最长边的像素上限
+
+    Returns:
+        tuple[str, bytes] | None: (扩展名, 编码后的图像字节)，无需缩小或无法解析时返回None
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(image_file) as img:
+            if max(img.size) <= max_edge:
+                return None
+            keep_png = img.format in ("PNG", "GIF") or "A" in img.getbands()
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            buffer = io.BytesIO()
+            if keep_png:
+                img.save(buffer, format="PNG")
+                return "png", buffer.getvalue()
+            img.convert("RGB").save(buffer, format="JPEG", quality=90)
+            return "jpeg", buffer.getvalue()
+    except Exception as e:
+        logger.warning(f"缩小图像失败，使用原图: {getattr(image_file, 'name', '')}, {e}")
+        return None
+
+
+def _b64encode_into(image_file, out: bytearray):
+    """
+    分块对文件内容进行Base64编码并追加到out中。
+
+    每块大小为3的整数倍，块与块之间不会产生填充字符，拼接结果与一次性编码完全一致，
+    但无需同时在内存中保留完整的原始字节和编码结果。
+
+    Args:
+        image_file: 以二进制模式打开的文件对象
+        out (bytearray): 接收编码结果的缓冲区
+    """
+    for chunk in iter(lambda: image_file.read(_B64_CHUNK_SIZE), b""):
+        out += base64.b64encode(chunk)
 
 
 def image_to_base64(image_path: str) -> str:
@@ -238,9 +619,10 @@ def image_to_base64(image_path: str) -> str:
     Returns:
         str: Base64编码的字符串
     """
+    encoded = bytearray()
     with open(image_path, "rb") as image_file:
-        encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-    return encoded_string
+        _b64encode_into(image_file, encoded)
+    return encoded.decode("ascii")
 
 
 def extract_markdown_content(text: str) -> str:
@@ -253,19 +635,10 @@ def extract_markdown_content(text: str) -> str:
     Returns:
         str: 提取的Markdown内容，如果没有找到Markdown标记，则返回原始文本
     """
-    start_marker = "```markdown"
-    end_marker = "```"
-
-    start_index = text.find(start_marker)
-    if start_index == -1:
+    match = _MARKDOWN_FENCE_RE.search(text) if text else None
+    if match is None:
         return text.strip() if text else None
-
-    start_index += len(start_marker)
-    end_index = text.find(end_marker, start_index)
-
-    if end_index == -1:
-        return text[start_index:].strip()
-    return text[start_index:end_index].strip()
+    return match.group(1).strip()
 
 
 def describe_image(
@@ -274,6 +647,7 @@ def describe_image(
     model: str = "Qwen/Qwen2-VL-72B-Instruct",
     prompt: str = None,
     description_prompt_path: str = None,
+    max_tokens: int | None = _DESCRIBE_MAX_TOKENS,
 ) -> str:
     """
     描述图像的内容。
@@ -284,17 +658,23 @@ def describe_image(
         model (str): 使用的模型名称
         prompt (str): 描述的提示信息
         description_prompt_path (str): 描述提示文件路径
+        max_tokens (int): 描述的最大token数，默认200；需要更详细的描述时可调大，
+            传入None表示不限制
 
     Returns:
         str: 图像内容描述
     """
-    extractor = ImageTextExtractor(
-        api_key=api_key, prompt=prompt, prompt_path=description_prompt_path
-    )
+    extractor = _get_extractor(api_key)
+    prompt = _resolve_prompt(extractor, prompt, description_prompt_path)
 
     try:
         result = extractor.extract_image_text(
-            local_image_path=image_path, model=model, detail="low"
+            local_image_path=image_path,
+            model=model,
+            prompt=prompt,
+            detail="low",
+            max_edge=_DESCRIBE_MAX_EDGE,
+            max_tokens=max_tokens,
         )
         if not result.strip():
             return None
@@ -323,11 +703,12 @@ def extract_text_from_image(
     Returns:
         str: 提取的文本内容
     """
-    extractor = ImageTextExtractor(api_key=api_key, prompt=prompt, prompt_path=ocr_prompt_path)
+    extractor = _get_extractor(api_key)
+    prompt = _resolve_prompt(extractor, prompt, ocr_prompt_path)
 
     try:
         result = extractor.extract_image_text(
-            local_image_path=image_path, model=model, detail="low"
+            local_image_path=image_path, model=model, detail="low", prompt=prompt
         )
         if not result.strip():
             return None
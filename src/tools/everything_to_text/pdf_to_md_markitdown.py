@@ -16,6 +16,10 @@
   - `ocr_enabled (bool, optional)`: 是否启用OCR功能，默认不启用。
   - **返回值**：返回一个包含`text_content`（转换后的Markdown文本），`metadata`（附加元数据），以及`images`（转换过程中提取的图片）的字典。
 
+- **markitdown_pdf2md_stream函数**：
+  - `stream (BinaryIO)`: PDF内容的二进制文件对象，如`io.BytesIO`；其余参数同`markitdown_pdf2md`。
+  - **返回值**：同`markitdown_pdf2md`。
+
 #### 注意事项：
 - 请确保安装了`markitdown`、`loguru`等依赖库。
 - 只支持PDF文件格式。
@@ -26,9 +30,34 @@
 """
 
 import os
-from typing import Dict, Any
+import stat
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict
 from pathlib import Path
-from markitdown import MarkItDown
+
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
+
+# markitdown 会连带导入大量格式解析依赖，放到首次转换时再导入，缩短模块导入耗时
+
+
+@lru_cache(maxsize=8)
+def _get_markitdown(llm_client: Any = None, llm_model: str = None) -> "MarkItDown":
+    """获取MarkItDown实例，相同的LLM配置复用同一实例，避免每次转换重复初始化内部转换器
+
+    Args:
+        llm_client (Any, optional): LLM客户端
+        llm_model (str, optional): LLM模型名称
+
+    Returns:
+        MarkItDown: MarkItDown实例
+    """
+    from markitdown import MarkItDown
+
+    # 根据是否提供LLM客户端来初始化MarkItDown
+    if llm_client and llm_model:
+        return MarkItDown(llm_client=llm_client, llm_model=llm_model)
+    return MarkItDown()
 
 
 def markitdown_pdf2md(
@@ -51,7 +80,11 @@ def markitdown_pdf2md(
         Dict: 包含转换结果的字典
     """
     file_path = Path(file_path)
-    if not file_path.exists():
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+    if not stat.S_ISREG(st.st_mode):
         raise FileNotFoundError(f"文件不存在: {file_path}")
 
     ext = file_path.suffix.lower()
@@ -59,13 +92,43 @@ def markitdown_pdf2md(
         raise ValueError(f"只支持PDF文件，当前文件类型: {ext}")
 
     try:
-        # 根据是否提供LLM客户端来初始化MarkItDown
         if llm_client and llm_model:
-            md = MarkItDown(llm_client=llm_client, llm_model=llm_model)
+            md = _get_markitdown(llm_client, llm_model)
         else:
-            md = MarkItDown()
+            md = _get_markitdown()
 
         result = md.convert(str(file_path))
         return {"text_content": result.text_content, "metadata": {}, "images": []}
     except Exception as e:
         raise Exception(f"PDF转换失败: {str(e)}")
+
+
+def markitdown_pdf2md_stream(
+    stream: BinaryIO,
+    llm_client: Any = None,
+    llm_model: str = None,
+    config: Dict = None,
+    ocr_enabled: bool = False,
+) -> Dict:
+    """将内存中的PDF内容转换为Markdown，URL下载的文件无需先写入磁盘
+
+    Args:
+        stream (BinaryIO): PDF内容的二进制文件对象
+        llm_client (Any, optional): LLM客户端，用于图像描述等高级功能
+        llm_model (str, optional): LLM模型名称
+        config (Dict, optional): 配置信息
+        ocr_enabled (bool, optional): 是否启用OCR功能，默认不启用
+
+    Returns:
+        Dict: 包含转换结果的字典
+    """
+    try:
+        if llm_client and llm_model:
+            md = _get_markitdown(llm_client, llm_model)
+        else:
+            md = _get_markitdown()
+
+        result = md.convert_stream(stream, file_extension=".pdf")
+        return {"text_content": result.text_content, "metadata": {}, "images": []}
+    except Exception as e:
+        raise Exception(f"PDF转换失败: {str(e)}")
@@ -37,23 +37,39 @@
 import os
 import json
 import requests
-from modelscope import snapshot_download
-from magic_pdf.data.data_reader_writer import FileBasedDataWriter, FileBasedDataReader
-from magic_pdf.data.dataset import PymuDocDataset
-from magic_pdf.model.doc_analyze_by_custom_model import doc_analyze
-from magic_pdf.config.enums import SupportedPdfParseMethod
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 
+# modelscope 与 magic_pdf 会连带导入 PyTorch 等大型依赖，统一放到函数内部按需导入，
+# 避免仅使用其他转换器时也承担这部分导入开销
+
+
+# 复用连接的HTTP会话，连接失败或服务端临时错误时自动退避重试
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+    ),
+)
+
 
 def download_json(url):
     """下载JSON配置文件"""
-    response = requests.get(url)
+    response = _session.get(url, timeout=(5, 30))
     response.raise_for_status()
     return response.json()
 
 
 def download_and_setup_models():
     """下载并设置必要的模型文件"""
+    from modelscope import snapshot_download
+
     mineru_patterns = [
         "models/Layout/LayoutLMv3/*",
         "models/Layout/YOLO/*",
@@ -62,8 +78,14 @@ def download_and_setup_models():
         "models/TabRec/TableMaster/*",
         "models/TabRec/StructEqTable/*",
     ]
-    model_dir = snapshot_download("opendatalab/PDF-Extract-Kit-1.0", allow_patterns=mineru_patterns)
-    layoutreader_model_dir = snapshot_download("ppaanngggg/layoutreader")
+    # 两个模型仓库互不依赖，并行下载以缩短首次安装耗时
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        model_future = pool.submit(
+            snapshot_download, "opendatalab/PDF-Extract-Kit-1.0", allow_patterns=mineru_patterns
+        )
+        layoutreader_future = pool.submit(snapshot_download, "ppaanngggg/layoutreader")
+        model_dir = model_future.result()
+        layoutreader_model_dir = layoutreader_future.result()
     model_dir = model_dir + "/models"
     logger.info(f"model_dir is: {model_dir}")
     logger.info(f"layoutreader_model_dir is: {layoutreader_model_dir}")
@@ -97,23 +119,19 @@ def mineru_pdf2md(pdf_path, output_base_dir="outputs"):
     返回值:
         str: 生成的Markdown文件路径。
     """
-    os.makedirs(output_base_dir, exist_ok=True)  # 确保输出目录存在
-
-    # 获取文件名和不带后缀的文件名
-    pdf_file_name = os.path.basename(pdf_path)
-    name_without_suff = pdf_file_name.split(".")[0]
-
-    # 设置输出目录和图片存储目录
-    local_image_dir = os.path.join(output_base_dir, "images")
-    local_md_dir = output_base_dir
-    image_dir = os.path.basename(local_image_dir)
+    from magic_pdf.data.data_reader_writer import FileBasedDataWriter, FileBasedDataReader
+    from magic_pdf.data.dataset import PymuDocDataset
+    from magic_pdf.model.doc_analyze_by_custom_model import doc_analyze
+    from magic_pdf.config.enums import SupportedPdfParseMethod
 
-    # 创建目录
-    os.makedirs(local_image_dir, exist_ok=True)
+    # 设置输出目录和图片存储目录，一次性创建
+    output_dir = Path(output_base_dir).resolve()
+    local_image_dir = output_dir / "images"
+    local_image_dir.mkdir(parents=True, exist_ok=True)
+    output_md_path = output_dir / f"{Path(pdf_path).stem}.md"
 
     # 初始化数据读写器
-    image_writer = FileBasedDataWriter(local_image_dir)
-    md_writer = FileBasedDataWriter(local_md_dir)
+    image_writer = FileBasedDataWriter(str(local_image_dir))
     reader = FileBasedDataReader("")
 
     # 读取PDF文件内容
@@ -123,22 +141,17 @@ def mineru_pdf2md(pdf_path, output_base_dir="outputs"):
     ds = PymuDocDataset(pdf_bytes)
 
     # 根据文档类型选择不同的处理方式（OCR模式或文本模式）
-    if ds.classify() == SupportedPdfParseMethod.OCR:
-        infer_result = ds.apply(doc_analyze, ocr=True)
-        pipe_result = infer_result.pipe_ocr_mode(image_writer)
-    else:
-        infer_result = ds.apply(doc_analyze, ocr=False)
-        pipe_result = infer_result.pipe_txt_mode(image_writer)
+    ocr = ds.classify() == SupportedPdfParseMethod.OCR
+    infer_result = ds.apply(doc_analyze, ocr=ocr)
+    pipe = infer_result.pipe_ocr_mode if ocr else infer_result.pipe_txt_mode
+    pipe_result = pipe(image_writer)
 
     # 获取并保存Markdown内容
-    md_content = pipe_result.get_markdown(image_dir)
-    output_md_path = os.path.join(local_md_dir, f"{name_without_suff}.md")
+    md_content = pipe_result.get_markdown(local_image_dir.name)
 
     # 将Markdown内容写入文件
     with open(output_md_path, "w", encoding="utf-8") as f:
         f.write(md_content)
 
     # 返回生成的Markdown文件的绝对路径
-    current_file_dir = os.path.abspath(os.path.dirname(__file__))
-    abs_file_path = os.path.join(current_file_dir, output_md_path)
-    return abs_file_path
+    return str(output_md_path)
@@ -0,0 +1,113 @@
+"""
+#### 使用说明：
+
+该代码提供了基于pypdfium2的PDF纯文本提取功能的封装。
+
+#### 主要功能：
+- 使用PDFium（C++实现）逐页提取PDF中的文本，速度远快于基于pdfminer的解析
+- 读取PDF的标题、作者、创建时间等元数据
+
+#### 参数说明：
+
+- **pdfium_pdf2md函数**：
+  - `file_path (str)`: 要转换的PDF文件路径。
+  - **返回值**：返回一个包含`text_content`（提取的文本，页与页之间以空行分隔），`metadata`（PDF元数据），以及`images`（始终为空列表）的字典。
+
+- **pdfium_pdf2md_stream函数**：
+  - `stream (BinaryIO)`: PDF内容的二进制文件对象，如`io.BytesIO`。
+  - **返回值**：同`pdfium_pdf2md`。
+
+#### 注意事项：
+- 请确保安装了`pypdfium2`。
+- 只提取文本，不识别标题、表格等版面结构，也不提取图片；需要Markdown结构时请使用markitdown或mineru转换器。
+
+#### 更多信息：
+- 在配置文件中将`document_converter.converter_name`设置为`pdfium`即可启用。
+
+"""
+
+import os
+import stat
+from pathlib import Path
+from typing import BinaryIO, Dict
+
+# PDF元数据字段到结果字段的映射
+_METADATA_FIELDS = {
+    "Title": "title",
+    "Author": "author",
+    "CreationDate": "creation_date",
+    "ModDate": "modification_date",
+}
+
+
+def pdfium_pdf2md(file_path: str, **kwargs) -> Dict:
+    """使用pypdfium2提取PDF文本
+
+    Args:
+        file_path (str): PDF文件路径
+        **kwargs: 其他转换器使用的参数（如config、llm_client），此处忽略
+
+    Returns:
+        Dict: 包含转换结果的字典
+    """
+    file_path = Path(file_path)
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+    if not stat.S_ISREG(st.st_mode):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    ext = file_path.suffix.lower()
+    if ext != ".pdf":
+        raise ValueError(f"只支持PDF文件，当前文件类型: {ext}")
+
+    return _extract_text(str(file_path))
+
+
+def pdfium_pdf2md_stream(stream: BinaryIO, **kwargs) -> Dict:
+    """使用pypdfium2从内存中的PDF内容提取文本，无需先写入磁盘
+
+    Args:
+        stream (BinaryIO): PDF内容的二进制文件对象
+        **kwargs: 其他转换器使用的参数（如config、llm_client），此处忽略
+
+    Returns:
+        Dict: 包含转换结果的字典
+    """
+    return _extract_text(stream.read())
+
+
+def _extract_text(pdf_input) -> Dict:
+    """逐页提取PDF文本与元数据
+
+    Args:
+        pdf_input: PDF文件路径或PDF内容的bytes
+
+    Returns:
+        Dict: 包含转换结果的字典
+    """
+    import pypdfium2 as pdfium
+
+    try:
+        pdf = pdfium.PdfDocument(pdf_input)
+        try:
+            pages = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+
+            raw_metadata = pdf.get_metadata_dict()
+            metadata = {
+                field: raw_metadata[key]
+                for key, field in _METADATA_FIELDS.items()
+                if raw_metadata.get(key)
+            }
+        finally:
+            pdf.close()
+
+        return {"text_content": "\n\n".join(pages), "metadata": metadata, "images": []}
+    except Exception as e:
+        raise Exception(f"PDF转换失败: {str(e)}")
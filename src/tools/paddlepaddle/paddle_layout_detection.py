@@ -13,9 +13,9 @@
 
 #### 参数说明：
 detect_layout函数参数：
-    image_path (str): 输入图像的路径
+    image_path (str | list): 输入图像的路径，传入列表时整批送入模型推理
     model_name (str): 模型名称，默认为"PP-DocLayout-L"
-    batch_size (int): 批处理大小，默认为1
+    batch_size (int): 批处理大小，默认为8
     layout_nms (bool): 是否使用NMS处理布局结果，默认为True
     save_path (str): 保存结果图像的路径，默认为"./output/"
     json_path (str): 保存JSON结果的路径，默认为"./output/res.json"
@@ -48,9 +48,30 @@ https://paddlepaddle.github.io/PaddleX/main/installation/installation.html#1
 
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4)
+def _get_model(model_name):
+    """
+    按模型名称创建并缓存布局检测模型，重复调用时复用已加载的权重
+
+    Args:
+        model_name (str): 模型名称
+
+    Returns:
+        模型实例
+    """
+    from paddlex import create_model
+
+    return create_model(model_name=model_name)
+
+
 def detect_layout(image_path,
                   model_name="PP-DocLayout-L",
-                  batch_size=1, 
+                  batch_size=8,
                   layout_nms=True, 
                   save_path="./output/result.png", 
                   json_path="./output/res.json"):
@@ -58,28 +79,54 @@ def detect_layout(image_path,
     使用PP-DocLayout模型检测文档布局
     
     Args:
-        image_path (str): 输入图像的路径
+        image_path (str | list): 输入图像的路径，传入列表时按batch_size分批推理，
+            减少逐张调用带来的模型调度开销
         model_name (str): 模型名称
         batch_size (int): 批处理大小
         layout_nms (bool): 是否使用NMS处理布局结果
-        save_path (str): 保存结果图像的路径
-        json_path (str): 保存JSON结果的路径
+        save_path (str): 保存结果图像的路径，多张图像时依次追加序号
+        json_path (str): 保存JSON结果的路径，多张图像时依次追加序号
     
     Returns:
         list: 检测结果列表
     """
-    from paddlex import create_model
-    
-    # 创建模型
-    model = create_model(model_name=model_name)
+    image_paths = [image_path] if isinstance(image_path, str) else list(image_path)
+
+    # 获取模型（首次调用时加载）
+    model = _get_model(model_name)
     
     # 预测
-    output = model.predict(image_path, batch_size=batch_size, layout_nms=layout_nms)
+    output = list(model.predict(image_paths, batch_size=batch_size, layout_nms=layout_nms))
     
-    # 处理结果
+    # 处理结果：推理完成后统一保存，图像编码与JSON写入放到线程池中并行执行
     for res in output:
         res.print()
-        res.save_to_img(save_path=save_path)
-        res.save_to_json(save_path=json_path)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = []
+        for i, res in enumerate(output):
+            img_path = _indexed_path(save_path, i, len(output))
+            res_json_path = _indexed_path(json_path, i, len(output))
+            futures.append(pool.submit(res.save_to_img, save_path=img_path))
+            futures.append(pool.submit(res.save_to_json, save_path=res_json_path))
+        for future in futures:
+            future.result()
     
-    return output
\ No newline at end of file
+    return output
+
+
+def _indexed_path(path, index, total):
+    """
+    多张图像时为输出路径追加序号，避免结果互相覆盖
+
+    Args:
+        path (str): 原始输出路径
+        index (int): 图像序号
+        total (int): 图像总数
+
+    Returns:
+        str: 输出路径
+    """
+    if total == 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{index}{ext}"
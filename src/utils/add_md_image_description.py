@@ -12,9 +12,10 @@
 
 #### 参数说明：
 
-- `read_markdown_files(path)`
+- `read_markdown_files(path, ignore_dirs=...)`
   - 参数:
     - `path`: str 或 Path对象，指定要搜索的目录或文件路径。
+    - `ignore_dirs`: 递归搜索时跳过的目录名，默认跳过.git、node_modules等。
   - 返回:
     - list: 包含所有找到的Markdown文件路径的列表。
 
@@ -36,22 +37,85 @@
 
 - 路径必须是绝对路径。
 - 依赖 `describe_image` 函数，需要确保该函数可用。
+- 同一文件内的图片并发请求描述，最大并发数由环境变量 `SMARTPAPER_LLM_CONCURRENCY` 控制（导入时读取，默认6，取值无效时使用默认值）。
 
 """
 
+import hashlib  # 用于计算图片内容摘要
 import os  # 用于文件和目录操作
 import re  # 用于正则表达式处理
+import threading  # 用于保护多线程共享的缓存
+from collections import OrderedDict  # 用于有容量上限的进程内缓存
+from concurrent.futures import ThreadPoolExecutor, as_completed  # 用于并发请求图片描述
 from pathlib import Path  # 用于跨平台的路径操作
-from tools.everything_to_text.image_to_text import describe_image
 from loguru import logger
 
+# 图片描述的磁盘缓存目录，可通过环境变量SMARTPAPER_CACHE_DIR修改根目录
+_VLM_CACHE_DIR = Path(os.getenv("SMARTPAPER_CACHE_DIR", "~/.cache/smartpaper")).expanduser() / "vlm"
 
-def read_markdown_files(path):
+# 进程内的图片描述缓存（按插入顺序淘汰），多线程并发访问时需加锁
+_MEMORY_CACHE_SIZE = 1024
+_MEMORY_CACHE = OrderedDict()
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+# Markdown图片标记：![描述](路径)。路径部分用[^)\n]*代替.*?，匹配结果相同但无需回溯
+_MD_IMAGE_RE = re.compile(r"!\[(.*?)\]\(([^)\n]*)\)")
+
+# 图片描述中需要去除的、会破坏Markdown图片语法的字符
+_DESC_SANITIZE_RE = re.compile(r"[\[\]\|\n\<\>\{\}\(\)\\\#\*`]")
+
+# Markdown文件后缀
+_MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# 未指定提示词时使用的默认图片描述提示词
+_DEFAULT_PROMPT = (
+    "用2-3句话简洁描述图中的主要主体、关键文字/数据和整体场景。"
+    "若为图表，请包含坐标轴与关键数值。"
+)
+
+# 视觉模型（尤其是小模型）偶尔只返回一两个词，短于该字符数的描述视为无效并重试一次
+_MIN_DESCRIPTION_CHARS = 8
+_DEGENERATE_DESCRIPTIONS = frozenset({"in", "this", "the", "a", "图像", "图片", "这张图片"})
+
+# 递归搜索时默认跳过的目录，这些目录通常文件极多且不包含需要处理的Markdown
+_IGNORE_DIRS = frozenset({".git", "node_modules", ".venv", "venv", "__pycache__"})
+
+
+def _read_concurrency(default=6):
+    """
+    读取环境变量SMARTPAPER_LLM_CONCURRENCY作为图片描述的最大并发数
+
+    参数:
+        default: int, 未设置或取值无效时使用的并发数
+
+    返回:
+        int: 不小于1的并发数
+    """
+    value = os.getenv("SMARTPAPER_LLM_CONCURRENCY", "")
+    try:
+        concurrency = int(value)
+    except ValueError:
+        if value:
+            logger.warning(f"SMARTPAPER_LLM_CONCURRENCY取值无效，使用默认值{default}: {value!r}")
+        return default
+    if concurrency < 1:
+        logger.warning(f"SMARTPAPER_LLM_CONCURRENCY应不小于1，使用默认值{default}: {value!r}")
+        return default
+    return concurrency
+
+
+# 图片描述的最大并发数，与其他LLM请求共用SMARTPAPER_LLM_CONCURRENCY设置，避免触发服务端限流
+_LLM_CONCURRENCY = _read_concurrency()
+
+
+def read_markdown_files(path, ignore_dirs=_IGNORE_DIRS):
     """
     读取指定路径下的所有Markdown文件
 
     参数:
         path: str 或 Path对象，指定要搜索的目录或文件路径
+        ignore_dirs: 可迭代对象，递归搜索时跳过的目录名，默认跳过.git、node_modules、
+            虚拟环境和__pycache__
 
     返回:
         list: 包含所有找到的Markdown文件路径的列表
@@ -60,68 +124,209 @@ def read_markdown_files(path):
     if not path.is_absolute():
         raise ValueError("路径必须是绝对路径")
     # 如果输入路径是文件且为Markdown格式，直接返回该文件路径
-    if path.is_file() and path.suffix.lower() in (".md", ".markdown"):
+    if path.is_file() and path.suffix.lower() in _MARKDOWN_SUFFIXES:
         return [str(path)]
     # 递归搜索目录下所有Markdown文件
-    return [str(p) for p in path.rglob("*") if p.suffix.lower() in (".md", ".markdown")]
+    return _scan_markdown_files(str(path), frozenset(ignore_dirs))
 
 
-def process_markdown_image(file_path, force_add_desc=False, prompt=None):
+def _scan_markdown_files(root, ignore_dirs):
     """
-    处理单个Markdown文件，为无描述的图片添加AI生成的描述
+    基于os.scandir递归搜索Markdown文件，直接使用目录项自带的类型信息，
+    并整棵跳过ignore_dirs中的目录
 
     参数:
-        file_path: str, Markdown文件的路径
-        force_add_desc: bool, 是否强制为所有图片添加描述
+        root: str, 搜索的根目录
+        ignore_dirs: frozenset, 跳过的目录名
 
-    副作用:
-        - 修改原始Markdown文件
-        - 在控制台输出处理状态
+    返回:
+        list: Markdown文件路径列表
+    """
+    markdown_files = []
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in ignore_dirs:
+                            pending.append(entry.path)
+                    elif entry.name.lower().endswith(_MARKDOWN_SUFFIXES):
+                        markdown_files.append(entry.path)
+        except OSError as e:
+            logger.warning(f"无法读取目录: {e}")
+    return markdown_files
+
+
+def _list_file_names(directory):
     """
-    prompt = (
-        prompt
-        or """
-# 图像内容描述提示
+    用一次os.scandir列出目录下的所有文件名，代替对每张图片分别调用os.path.exists
 
-## 任务
-使用视觉语言模型生成图像内容的详细描述。
+    参数:
+        directory: str, 目录路径
 
-## 背景
-- 视觉语言模型可以处理图像并生成文本描述
-- 需要结构化输出以实现一致的图像分析
-- 关注关键视觉元素及其关系
+    返回:
+        set: 文件名集合，目录不存在或无法读取时为空集合
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
 
-## 输入
-- 图像格式：JPG、PNG或类似的视觉格式
-- 图像内容：任何视觉场景、物体或构图
 
-## 输出
-请描述图像的以下方面：
-1. 场景中的主要主体/物体
-2. 元素之间的空间关系
-3. 颜色和视觉特征
-4. 动作或活动（如果有）
-5. 环境背景
-6. 任何文本或符号
-7. 整体场景构图
+def _image_digest(image_path):
+    """
+    计算图片内容的BLAKE2b摘要
+
+    参数:
+        image_path: str, 图片路径
+
+    返回:
+        str: 十六进制摘要；按1MB分块读取整个文件，大图也不会一次性读入内存
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(image_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-示例模板：
-"这张图片显示了[主要主体]在[位置]。[物体]是[空间关系]。主要颜色是[颜色]。[关于动作/背景的其他详细信息]。"
 
+def _describe_image_cached(image_path, prompt):
     """
-    )
+    带缓存的图片描述，缓存键为图片完整内容的摘要与提示词摘要
+
+    先查进程内缓存，再查磁盘缓存，都未命中时才请求视觉模型。反复处理同一目录，
+    或多个Markdown文件引用内容相同的图片时，不会重复请求。修改提示词后缓存键随之变化。
+    描述为空或过于简短时，附带提示重试一次；最终描述失败或仍无效时不写入缓存。
+
+    参数:
+        image_path: str, 图片路径
+        prompt: str, 描述提示词
+
+    返回:
+        str: 图片描述
+    """
+    prompt_digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).hexdigest()
+    cache_name = f"{_image_digest(image_path)}-{prompt_digest}.txt"
+    with _MEMORY_CACHE_LOCK:
+        description = _MEMORY_CACHE.get(cache_name)
+    if description is not None:
+        return description
+
+    cache_path = _VLM_CACHE_DIR / cache_name
+    try:
+        description = cache_path.read_text(encoding="utf-8")
+    except OSError:
+        # 首次需要请求视觉模型时才导入，只扫描Markdown文件时不必加载openai等依赖
+        from tools.everything_to_text.image_to_text import describe_image
+
+        description = describe_image(image_path, prompt=prompt)
+        if description and description.startswith("描述图像时出错"):
+            return description
+        if _is_degenerate_description(description):
+            retry_prompt = (
+                f"{prompt}\n\n你上次的描述 '{description or ''}' 过于简短，"
+                "请给出至少 2 句话的具体描述。"
+            )
+            description = describe_image(image_path, prompt=retry_prompt)
+        if _is_degenerate_description(description):
+            return description
+        try:
+            _VLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _atomic_write_text(cache_path, description)
+        except OSError as e:
+            logger.warning(f"写入图片描述缓存失败: {cache_path}, {e}")
+
+    with _MEMORY_CACHE_LOCK:
+        _MEMORY_CACHE[cache_name] = description
+        while len(_MEMORY_CACHE) > _MEMORY_CACHE_SIZE:
+            _MEMORY_CACHE.popitem(last=False)
+    return description
+
+
+def _is_degenerate_description(description):
+    """
+    判断视觉模型返回的描述是否无效（为空、出错或过于简短）
+
+    参数:
+        description: str或None, describe_image的返回值
+
+    返回:
+        bool: 是否无效
+    """
+    if not description or description.startswith("描述图像时出错"):
+        return True
+    text = _DESC_SANITIZE_RE.sub("", description).strip()
+    return len(text) < _MIN_DESCRIPTION_CHARS or text.lower() in _DEGENERATE_DESCRIPTIONS
+
+
+def process_markdown_image(file_path, force_add_desc=False, prompt=None):
+    """
+    处理单个Markdown文件，为无描述的图片添加AI生成的描述
+
+    参数:
+        file_path: str, Markdown文件的路径
+        force_add_desc: bool, 是否强制为所有图片添加描述
+
+    副作用:
+        - 修改原始Markdown文件
+        - 在控制台输出处理状态
+    """
+    prompt = prompt or _DEFAULT_PROMPT
     try:
         file_path = Path(file_path).resolve()  # 转换为绝对路径
         if not file_path.is_absolute():
             raise ValueError("文件路径必须是绝对路径")
 
-        # 读取Markdown文件内容
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        # 读取Markdown文件内容；不含图片标记的文件无需解码和正则扫描
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        if b"![" not in raw:
+            logger.info(f"无需修改: {file_path}")
+            return
+        # 与文本模式读取一致，统一换行符为\n
+        content = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
 
         # 获取Markdown文件所在目录路径
         markdown_dir = os.path.dirname(file_path)
-        modified = False  # 标记文件是否被修改
+
+        # 第一遍：收集需要添加描述的图片，以图片标记在文中的位置为键
+        image_jobs = {}
+        dir_files = {}  # 目录 -> 目录下的文件名集合，每个目录只扫描一次
+        for match in _MD_IMAGE_RE.finditer(content):
+            desc, img_path = match.groups()
+            # 当强制添加描述或原描述为空时处理
+            if force_add_desc or not desc.strip():
+                # 构建图片的完整路径
+                full_path = os.path.normpath(os.path.join(markdown_dir, img_path))
+                image_dir, image_name = os.path.split(full_path)
+                if image_dir not in dir_files:
+                    dir_files[image_dir] = _list_file_names(image_dir)
+                # 集合查找区分大小写；未命中时再用os.path.exists确认，
+                # 兼容大小写不敏感的文件系统（Windows、macOS）上大小写不一致的引用
+                if image_name in dir_files[image_dir] or os.path.exists(full_path):
+                    image_jobs[match.start()] = full_path
+
+        # 第二遍：并发请求视觉模型，重叠各张图片的网络等待时间；
+        # 同一图片被多次引用时只请求一次
+        descriptions = {}
+        if image_jobs:
+            unique_paths = list(dict.fromkeys(image_jobs.values()))
+            with ThreadPoolExecutor(max_workers=_LLM_CONCURRENCY) as pool:
+                futures = {
+                    pool.submit(_describe_image_cached, full_path, prompt): full_path
+                    for full_path in unique_paths
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        descriptions[futures[future]] = future.result()
+                    except FileNotFoundError:
+                        # 扫描目录后图片被删除时，由打开文件时的异常兜底，保留原图片标记
+                        logger.warning(f"图片不存在: {futures[future]}")
+                        continue
+                    logger.info(f"图片描述进度 {done}/{len(futures)}: {futures[future]}")
+        modified = bool(descriptions)  # 标记文件是否被修改
 
         def desc_replacer(match):
             """
@@ -133,32 +338,19 @@ def process_markdown_image(file_path, force_add_desc=False, prompt=None):
             返回:
                 str: 处理后的图片标记字符串
             """
-            nonlocal modified
-            desc, img_path = match.groups()
-            # 当强制添加描述或原描述为空时处理
-            if force_add_desc or not desc.strip():
-                # 构建图片的完整路径
-                full_path = os.path.normpath(os.path.join(markdown_dir, img_path))
-                if os.path.exists(full_path):
-
-                    # 使用正则表达式去除描述中的特殊字符
-                    new_desc = re.sub(
-                        r"[\[\]\|\n\<\>\{\}\(\)\\\#\*`]",
-                        "",
-                        describe_image(full_path, prompt=prompt),
-                    )
-                    modified = True
-                    return f"![{new_desc}]({img_path})"
-            return match.group(0)
-
-        # 使用正则表达式匹配并替换图片标记
-        pattern = re.compile(r"!\[(.*?)\]\((.*?)\)")
-        new_content = pattern.sub(desc_replacer, content)
+            description = descriptions.get(image_jobs.get(match.start()))
+            if description is None:
+                return match.group(0)
+            # 使用正则表达式去除描述中的特殊字符
+            new_desc = _DESC_SANITIZE_RE.sub("", description)
+            return f"![{new_desc}]({match.group(2)})"
+
+        # 第三遍：替换图片标记
+        new_content = _MD_IMAGE_RE.sub(desc_replacer, content)
 
         # 如果文件被修改，写入新内容
-        if modified:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
+        if modified and new_content != content:
+            _atomic_write_text(file_path, new_content)
             logger.info(f"已更新文件: {file_path}")
         else:
             logger.info(f"无需修改: {file_path}")
@@ -167,6 +359,25 @@ def process_markdown_image(file_path, force_add_desc=False, prompt=None):
         logger.error(f"处理文件 {file_path} 时出错: {str(e)}")
 
 
+def _atomic_write_text(file_path, text):
+    """
+    先写入同目录下的临时文件再替换原文件，写入中途出错时原文件保持完整
+
+    参数:
+        file_path: str 或 Path对象，目标文件路径
+        text: str, 要写入的内容
+    """
+    tmp_path = f"{file_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def add_md_image_description(path, force_add_desc=True):
     """
     主处理流程
@@ -1,3 +1,5 @@
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from abc import ABC, abstractmethod
 from langchain.chat_models.base import BaseChatModel
@@ -5,6 +7,30 @@ from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
 import zhipuai
 from langchain_community.chat_models import ChatOpenAI
 
+# ChatOpenAI客户端缓存：(密钥, 端点, 模型, 温度, 最大token数) -> 客户端。
+# 适配器每次都新建，只共享无状态的客户端及其HTTP连接池，更新密钥不会影响其他适配器
+_CLIENT_CACHE: "OrderedDict[tuple, ChatOpenAI]" = OrderedDict()
+_CLIENT_CACHE_SIZE = 16
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _resolve_model(config: Dict[str, Any]) -> str:
+    """根据 default_model_index 选择模型
+
+    Args:
+        config (Dict[str, Any]): 提供商配置
+
+    Returns:
+        str: 模型名称
+    """
+    if "models" not in config:
+        return config["model"]
+    models = config["models"]
+    model_index = config.get("default_model_index", 0)
+    if not 0 <= model_index < len(models):
+        raise ValueError(f"default_model_index {model_index} 超出模型列表范围 [0, {len(models)-1}]")
+    return models[model_index]
+
 
 class BaseLLMAdapter(ABC):
     """LLM适配器基类"""
@@ -54,38 +80,45 @@ class OpenAIAdapter(BaseLLMAdapter):
         """
         self.config = config
 
-        # 根据 default_model_index 选择模型
-        if "models" in config:
-            try:
-                model_index = config.get("default_model_index", 0)
-                if not 0 <= model_index < len(config["models"]):
-                    raise ValueError(
-                        f"default_model_index {model_index} 超出模型列表范围 [0, {len(config['models'])-1}]"
-                    )
-                selected_model = config["models"][model_index]
-            except IndexError:
-                raise ValueError(
-                    f"default_model_index {model_index} 超出模型列表范围 [0, {len(config['models'])-1}]"
-                )
-        else:
-            selected_model = config["model"]
-
-        self.client = ChatOpenAI(
-            api_key=config["api_key"],
-            base_url=config.get("base_url"),  # 可选的自定义API端点
-            model=selected_model,
-            temperature=config["temperature"],
-            max_tokens=config["max_tokens"],
-            streaming=False,
+        self.model = _resolve_model(config)
+        # 流式与非流式调用共用同一个客户端，stream()不依赖构造时的streaming参数
+        self.client = self._build_client(config["api_key"])
+
+    def _build_client(self, api_key: str) -> ChatOpenAI:
+        """获取与当前配置对应的ChatOpenAI客户端，相同配置的适配器共用同一个客户端
+
+        Args:
+            api_key (str): API密钥
+
+        Returns:
+            ChatOpenAI: 客户端实例
+        """
+        cache_key = (
+            api_key,
+            self.config.get("base_url"),  # 可选的自定义API端点
+            self.model,
+            self.config["temperature"],
+            self.config["max_tokens"],
         )
-        self.stream_client = ChatOpenAI(
-            api_key=config["api_key"],
-            base_url=config.get("base_url"),
-            model=selected_model,
-            temperature=config["temperature"],
-            max_tokens=config["max_tokens"],
-            streaming=True,
+        with _CLIENT_CACHE_LOCK:
+            client = _CLIENT_CACHE.get(cache_key)
+            if client is not None:
+                _CLIENT_CACHE.move_to_end(cache_key)
+                return client
+
+        client = ChatOpenAI(
+            api_key=api_key,
+            base_url=self.config.get("base_url"),
+            model=self.model,
+            temperature=self.config["temperature"],
+            max_tokens=self.config["max_tokens"],
+            streaming=False,
         )
+        with _CLIENT_CACHE_LOCK:
+            _CLIENT_CACHE[cache_key] = client
+            while len(_CLIENT_CACHE) > _CLIENT_CACHE_SIZE:
+                _CLIENT_CACHE.popitem(last=False)
+        return client
 
     def __call__(self, messages: List[BaseMessage]) -> AIMessage:
         """调用OpenAI处理消息"""
@@ -93,29 +126,26 @@ class OpenAIAdapter(BaseLLMAdapter):
 
     def stream(self, messages: List[BaseMessage]):
         """流式调用OpenAI处理消息"""
-        for chunk in self.stream_client.stream(messages):
+        for chunk in self.client.stream(messages):
             if chunk.content:
                 yield chunk.content
 
     def update_api_key(self, api_key: str):
         """更新API密钥"""
         self.config["api_key"] = api_key
-        self.client = ChatOpenAI(
-            api_key=api_key,
-            base_url=self.config.get("base_url"),
-            model=self.config["model"],
-            temperature=self.config["temperature"],
-            max_tokens=self.config["max_tokens"],
-            streaming=False,
-        )
-        self.stream_client = ChatOpenAI(
-            api_key=api_key,
-            base_url=self.config.get("base_url"),
-            model=self.config["model"],
-            temperature=self.config["temperature"],
-            max_tokens=self.config["max_tokens"],
-            streaming=True,
-        )
+        self.client = self._build_client(api_key)
+
+
+# 消息类型 -> 智谱AI消息角色
+_ROLE_MAP = {SystemMessage: "system", HumanMessage: "user", AIMessage: "assistant"}
+
+
+def _subclass_role(msg: BaseMessage) -> Optional[str]:
+    """查找消息子类（如AIMessageChunk）对应的角色，未知类型返回None"""
+    for msg_type, role in _ROLE_MAP.items():
+        if isinstance(msg, msg_type):
+            return role
+    return None
 
 
 class ZhipuChatAdapter(BaseLLMAdapter):
@@ -130,21 +160,7 @@ class ZhipuChatAdapter(BaseLLMAdapter):
         self.config = config
         zhipuai.api_key = config["api_key"]
 
-        # 根据 default_model_index 选择模型
-        if "models" in config:
-            try:
-                model_index = config.get("default_model_index", 0)
-                if not 0 <= model_index < len(config["models"]):
-                    raise ValueError(
-                        f"default_model_index {model_index} 超出模型列表范围 [0, {len(config['models'])-1}]"
-                    )
-                self.model = config["models"][model_index]
-            except IndexError:
-                raise ValueError(
-                    f"default_model_index {model_index} 超出模型列表范围 [0, {len(config['models'])-1}]"
-                )
-        else:
-            self.model = config["model"]
+        self.model = _resolve_model(config)
 
         self.temperature = config["temperature"]
         self.max_tokens = config["max_tokens"]
@@ -181,15 +197,12 @@ class ZhipuChatAdapter(BaseLLMAdapter):
                 raise Exception(f"智谱AI流式调用失败: {event.data}")
 
     def _convert_messages(self, messages: List[BaseMessage]) -> List[Dict]:
-        """转换消息格式"""
+        """转换消息格式，跳过无法对应角色的消息"""
         zhipu_messages = []
         for msg in messages:
-            if isinstance(msg, SystemMessage):
-                zhipu_messages.append({"role": "system", "content": msg.content})
-            elif isinstance(msg, HumanMessage):
-                zhipu_messages.append({"role": "user", "content": msg.content})
-            elif isinstance(msg, AIMessage):
-                zhipu_messages.append({"role": "assistant", "content": msg.content})
+            role = _ROLE_MAP.get(type(msg)) or _subclass_role(msg)
+            if role:
+                zhipu_messages.append({"role": role, "content": msg.content})
         return zhipu_messages
 
     def update_api_key(self, api_key: str):
@@ -198,9 +211,25 @@ class ZhipuChatAdapter(BaseLLMAdapter):
         zhipuai.api_key = api_key
 
 
+# 提供商 -> (配置节名, 适配器类)
+_PROVIDERS = {
+    "openai": ("openai", OpenAIAdapter),
+    "openai_deepseek": ("openai_deepseek", OpenAIAdapter),
+    "openai_siliconflow": ("openai_siliconflow", OpenAIAdapter),
+    "openai_kimi": ("openai_kimi", OpenAIAdapter),
+    "openai_doubao": ("openai_doubao", OpenAIAdapter),
+    "zhipuai": ("zhipuai", ZhipuChatAdapter),
+    "ai_studio": ("ai_studio", OpenAIAdapter),
+    "ai_studio_fast_deploy": ("ai_studio_fast_deploy", OpenAIAdapter),
+}
+
+
 def create_llm_adapter(config: Dict[str, Any]) -> BaseLLMAdapter:
     """创建LLM适配器
 
+    每次调用都返回新的适配器，调用方可以独立更新各自的API密钥；
+    OpenAI兼容的适配器在配置相同时共用底层客户端
+
     Args:
         config (Dict[str, Any]): LLM配置
 
@@ -208,35 +237,8 @@ def create_llm_adapter(config: Dict[str, Any]) -> BaseLLMAdapter:
         BaseLLMAdapter: LLM适配器实例
     """
     provider = config["provider"].lower()
-    if provider == "openai":
-        return OpenAIAdapter(config["openai"])
-    elif provider == "openai_deepseek":
-        return OpenAIAdapter(config["openai_deepseek"])
-    elif provider == "openai_siliconflow":
-        return OpenAIAdapter(config["openai_siliconflow"])
-    elif provider == "openai_kimi":
-        return OpenAIAdapter(config["openai_kimi"])
-    elif provider == "openai_doubao":
-        return OpenAIAdapter(config["openai_doubao"])
-    elif provider == "zhipuai":
-        return ZhipuChatAdapter(config["zhipuai"])
-    provider = config["provider"].lower()
-
-    if provider == "openai":
-        return OpenAIAdapter(config["openai"])
-    elif provider == "openai_deepseek":
-        return OpenAIAdapter(config["openai_deepseek"])
-    elif provider == "openai_siliconflow":
-        return OpenAIAdapter(config["openai_siliconflow"])
-    elif provider == "openai_kimi":
-        return OpenAIAdapter(config["openai_kimi"])
-    elif provider == "openai_doubao":
-        return OpenAIAdapter(config["openai_doubao"])
-    elif provider == "zhipuai":
-        return ZhipuChatAdapter(config["zhipuai"])
-    elif provider == "ai_studio":
-        return OpenAIAdapter(config["ai_studio"])
-    elif provider == "ai_studio_fast_deploy":
-        return OpenAIAdapter(config["ai_studio_fast_deploy"])
-    else:
+    try:
+        section, adapter_cls = _PROVIDERS[provider]
+    except KeyError:
         raise ValueError(f"不支持的LLM提供商: {provider}")
+    return adapter_cls(config[section])
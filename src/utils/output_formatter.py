@@ -5,6 +5,18 @@ from datetime import datetime
 from typing import Dict, List, Any
 import pandas as pd
 
+# Markdown报告模板，url_line与desc_line在元数据缺少对应字段时为空
+_MARKDOWN_TEMPLATE = (
+    "# 论文分析报告\n\n"
+    "## 元数据\n"
+    "- 标题: {title}\n"
+    "- 作者: {author}\n"
+    "- 日期: {date}\n"
+    "{url_line}{desc_line}"
+    "- 分析时间: {timestamp}\n\n"
+    "## 分析结果{body}"
+)
+
 
 class OutputFormatter:
     """输出格式化工具"""
@@ -53,31 +65,27 @@ class OutputFormatter:
         Returns:
             Dict: 格式化后的内容
         """
-        # 构建Markdown内容
-        markdown = []
-
-        # 添加元数据
-        markdown.append("# 论文分析报告\n")
-        markdown.append("## 元数据")
-        markdown.append(f"- 标题: {metadata.get('title', 'N/A')}")
-        markdown.append(f"- 作者: {metadata.get('author', 'N/A')}")
-        markdown.append(f"- 日期: {metadata.get('date', 'N/A')}")
-        if "url" in metadata:
-            markdown.append(f"- URL: {metadata['url']}")
-        if "description" in metadata:
-            markdown.append(f"- 描述: {metadata['description']}")
-        markdown.append(f"- 分析时间: {timestamp}\n")
-
-        # 添加分析内容
-        markdown.append("## 分析结果")
+        # 分析内容
         if "result" in content:
-            markdown.append(content["result"])
+            body = f"\n{content['result']}"
         elif "structured_analysis" in content:
-            for section, text in content["structured_analysis"].items():
-                markdown.append(f"\n### {section.capitalize()}")
-                markdown.append(text)
-
-        return {"result": "\n".join(markdown), "metadata": metadata, "timestamp": timestamp}
+            body = "".join(
+                f"\n\n### {section.capitalize()}\n{text}"
+                for section, text in content["structured_analysis"].items()
+            )
+        else:
+            body = ""
+
+        markdown = _MARKDOWN_TEMPLATE.format(
+            title=metadata.get("title", "N/A"),
+            author=metadata.get("author", "N/A"),
+            date=metadata.get("date", "N/A"),
+            url_line=f"- URL: {metadata['url']}\n" if "url" in metadata else "",
+            desc_line=f"- 描述: {metadata['description']}\n" if "description" in metadata else "",
+            timestamp=timestamp,
+            body=body,
+        )
+        return {"result": markdown, "metadata": metadata, "timestamp": timestamp}
 
     def _format_csv(self, content: Dict, metadata: Dict, timestamp: str) -> Dict:
         """格式化为CSV格式
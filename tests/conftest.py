@@ -0,0 +1,24 @@
+"""
+测试共用的pytest fixture。
+"""
+
+from functools import lru_cache
+
+import pytest
+
+
+@pytest.fixture
+def isolated_extractor_cache(monkeypatch):
+    """
+    为image_to_text._get_extractor换上独立的lru_cache，避免测试用密钥创建的提取器
+    泄漏到其他测试；测试结束后由monkeypatch恢复原缓存。
+
+    Returns:
+        被替换后的_get_extractor，可通过cache_info()检查创建的提取器数量
+    """
+    # 在fixture内导入，未使用该fixture的测试不必加载openai等依赖
+    from tools.everything_to_text import image_to_text
+
+    isolated_get_extractor = lru_cache(maxsize=None)(image_to_text._get_extractor.__wrapped__)
+    monkeypatch.setattr(image_to_text, "_get_extractor", isolated_get_extractor)
+    return isolated_get_extractor
@@ -0,0 +1,124 @@
+"""
+测试SmartPaper的下载重试和arXiv转换缓存：使用mock的HTTP会话验证_get_with_retry的
+重试与连接释放、_fetch_etag的回退逻辑，以及基于ETag和文件修改时间的转换缓存。
+"""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("langchain")
+
+import requests
+
+import core.smart_paper_core as smart_paper_core
+from core.smart_paper_core import SmartPaper
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"HTTP {status_code}", response=response
+        )
+    return response
+
+
+@pytest.fixture
+def paper(monkeypatch):
+    monkeypatch.setattr(smart_paper_core.time, "sleep", lambda seconds: None)
+    instance = SmartPaper.__new__(SmartPaper)
+    instance.config = {"document_converter": {"download_max_retries": 2}}
+    instance.session = MagicMock()
+    return instance
+
+
+def test_get_with_retry_retries_then_succeeds(paper):
+    busy = _response(503)
+    ok = _response(200)
+    paper.session.get.side_effect = [busy, ok]
+
+    assert paper._get_with_retry("https://arxiv.org/pdf/1234") is ok
+    assert paper.session.get.call_count == 2
+    busy.close.assert_called_once()
+    ok.close.assert_not_called()
+
+
+def test_get_with_retry_retries_connection_errors(paper):
+    ok = _response(200)
+    paper.session.get.side_effect = [requests.exceptions.ConnectionError("reset"), ok]
+
+    assert paper._get_with_retry("https://arxiv.org/pdf/1234") is ok
+
+
+def test_get_with_retry_closes_response_on_final_failure(paper):
+    responses = [_response(503) for _ in range(3)]
+    paper.session.get.side_effect = responses
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        paper._get_with_retry("https://arxiv.org/pdf/1234")
+
+    assert paper.session.get.call_count == 3
+    for response in responses:
+        response.close.assert_called_once()
+
+
+def test_get_with_retry_does_not_retry_client_errors(paper):
+    missing = _response(404)
+    paper.session.get.side_effect = [missing]
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        paper._get_with_retry("https://arxiv.org/pdf/1234")
+
+    assert paper.session.get.call_count == 1
+    missing.close.assert_called_once()
+
+
+def test_fetch_etag_falls_back_to_last_modified(paper):
+    paper.session.head.return_value = _response(
+        200, {"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    )
+
+    assert paper._fetch_etag("https://arxiv.org/pdf/1234") == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def test_fetch_etag_returns_none_on_request_error(paper):
+    paper.session.head.side_effect = requests.exceptions.ConnectionError("offline")
+
+    assert paper._fetch_etag("https://arxiv.org/pdf/1234") is None
+
+
+def test_conversion_cache_matches_etag_and_converter(tmp_path):
+    cache_path = str(tmp_path / "1234.md.json")
+    pdf_path = str(tmp_path / "1234.pdf")
+    result = {"text_content": "正文", "metadata": {"title": "1234"}}
+    SmartPaper._save_cached_conversion(cache_path, '"v1"', "markitdown", result)
+
+    assert SmartPaper._load_cached_conversion(cache_path, '"v1"', "markitdown", pdf_path) == result
+    assert SmartPaper._load_cached_conversion(cache_path, '"v2"', "markitdown", pdf_path) is None
+    assert SmartPaper._load_cached_conversion(cache_path, '"v1"', "mineru", pdf_path) is None
+
+
+def test_conversion_cache_without_etag_compares_mtime(tmp_path):
+    cache_path = str(tmp_path / "1234.md.json")
+    pdf_path = str(tmp_path / "1234.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(b"%PDF-1.4")
+    result = {"text_content": "正文", "metadata": {}}
+    SmartPaper._save_cached_conversion(cache_path, None, "markitdown", result)
+
+    os.utime(pdf_path, (1000, 1000))
+    os.utime(cache_path, (2000, 2000))
+    assert SmartPaper._load_cached_conversion(cache_path, None, "markitdown", pdf_path) == result
+
+    os.utime(pdf_path, (3000, 3000))
+    assert SmartPaper._load_cached_conversion(cache_path, None, "markitdown", pdf_path) is None
+
+
+def test_conversion_cache_missing_file(tmp_path):
+    cache_path = str(tmp_path / "missing.md.json")
+
+    assert SmartPaper._load_cached_conversion(cache_path, '"v1"', "markitdown", "x.pdf") is None
@@ -3,6 +3,7 @@
 支持多种输入格式，包括本地和URL文件的转换，文本提取、图片提取、OCR识别等功能。
 """
 
+import io
 import os
 import sys
 import pytest
@@ -86,6 +87,35 @@ def test_pdf_to_md_markitdown(test_files, config_basic):
     assert has_md_format, "转换的内容不包含Markdown格式"
 
 
+def test_pdf_to_md_pdfium(test_files):
+    """测试pdfium转换器提取PDF纯文本"""
+    pytest.importorskip("pypdfium2")
+    if not os.path.exists(test_files["pdf"]):
+        pytest.skip("PDF测试文件不存在")
+
+    result = convert_to_text(test_files["pdf"], converter_name="pdfium")
+
+    assert isinstance(result, dict)
+    assert isinstance(result["metadata"], dict)
+    assert result["images"] == []
+    assert isinstance(result["text_content"], str)
+    assert len(result["text_content"]) > 0
+
+
+def test_pdf_to_md_pdfium_stream(test_files):
+    """测试pdfium转换器直接解析内存中的PDF内容"""
+    pytest.importorskip("pypdfium2")
+    if not os.path.exists(test_files["pdf"]):
+        pytest.skip("PDF测试文件不存在")
+
+    from tools.everything_to_text.pdf_to_md_pdfium import pdfium_pdf2md, pdfium_pdf2md_stream
+
+    with open(test_files["pdf"], "rb") as f:
+        result = pdfium_pdf2md_stream(io.BytesIO(f.read()))
+
+    assert result == pdfium_pdf2md(test_files["pdf"])
+
+
 @pytest.mark.skip("没有可用的图片测试文件")
 def test_convert_image_with_llm(test_files, config_with_llm):
     """测试带LLM的图片转换"""
@@ -10,6 +10,7 @@ import pytest
 
 
 from tools.everything_to_text.image_to_text import (
+    ImageTextExtractor,
     describe_image,
     save_result_to_file,
     extract_text_from_image,
@@ -114,6 +115,58 @@ def test_extract_markdown_content():
     assert result_without_markdown == "This is plain text"
 
 
+def test_extract_markdown_content_unterminated():
+    # 缺少结束标记时返回起始标记之后的全部内容
+    text = "Intro\n```markdown\n# Title\n\nBody text\n"
+
+    assert extract_markdown_content(text) == "# Title\n\nBody text"
+
+
+def test_extract_markdown_content_md_fence():
+    # 同样识别```md标记，但不提取其他语言的代码块
+    assert extract_markdown_content("```md\n# Title\n```") == "# Title"
+    assert extract_markdown_content("```python\nx = 1\n```") == "```python\nx = 1\n```"
+
+
+def test_get_image_extension_suffix_fallback(tmp_path):
+    # 魔数无法识别时只接受已知的图像后缀
+    photo = tmp_path / "photo.JPG"
+    photo.write_bytes(b"not a real header")
+    assert ImageTextExtractor._get_image_extension(str(photo)) == "jpeg"
+
+    notes = tmp_path / "notes.txt"
+    notes.write_bytes(b"plain text")
+    with pytest.raises(ValueError):
+        ImageTextExtractor._get_image_extension(str(notes))
+
+
+def test_describe_image_shares_extractor_across_prompts(
+    tmp_path, monkeypatch, image_path, isolated_extractor_cache
+):
+    # 提示文本按调用传入，不同提示共用同一个提取器；提示文件修改后重新读取
+    monkeypatch.setattr(
+        ImageTextExtractor,
+        "_request_text",
+        lambda self, request: request["messages"][0]["content"][1]["text"],
+    )
+    prompt_file = tmp_path / "prompt.md"
+    prompt_file.write_text("from file v1", encoding="utf-8")
+
+    assert describe_image(image_path, api_key="test-key", prompt="first") == "first"
+    assert describe_image(image_path, api_key="test-key", prompt="second") == "second"
+    assert (
+        describe_image(image_path, api_key="test-key", description_prompt_path=str(prompt_file))
+        == "from file v1"
+    )
+    prompt_file.write_text("from file v2", encoding="utf-8")
+    os.utime(prompt_file, ns=(0, os.stat(prompt_file).st_mtime_ns + 1_000_000))
+    assert (
+        describe_image(image_path, api_key="test-key", description_prompt_path=str(prompt_file))
+        == "from file v2"
+    )
+    assert isolated_extractor_cache.cache_info().currsize == 1
+
+
 @pytest.fixture
 def test_content():
     return "Test content"
@@ -4,10 +4,13 @@
 
 import sys
 import os
+import threading
+import time
 import pytest
 
 
-from utils.add_md_image_description import add_md_image_description
+import utils.add_md_image_description as md_desc
+from utils.add_md_image_description import add_md_image_description, read_markdown_files
 
 
 def test_add_image_description():
@@ -20,3 +23,127 @@ def test_add_image_description():
         add_md_image_description(abs_file_path, force_add_desc=True)
     except Exception:
         pytest.fail("add_md_image_description raised an exception")
+
+
+def test_read_markdown_files_skips_ignored_dirs(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    (tmp_path / "docs" / "b.MARKDOWN").write_text("b", encoding="utf-8")
+    (tmp_path / "docs" / "c.txt").write_text("c", encoding="utf-8")
+    (tmp_path / ".git" / "d.md").write_text("d", encoding="utf-8")
+
+    files = read_markdown_files(tmp_path)
+
+    assert sorted(os.path.basename(f) for f in files) == ["a.md", "b.MARKDOWN"]
+
+
+def test_process_markdown_image_describes_concurrently(tmp_path, monkeypatch):
+    for name in ("a.png", "b.png", "c.png"):
+        (tmp_path / name).write_bytes(name.encode())
+    md_file = tmp_path / "doc.md"
+    md_file.write_text(
+        "![](a.png)\n![](b.png)\n![](c.png)\n![](a.png)\n![](missing.png)\n", encoding="utf-8"
+    )
+
+    lock = threading.Lock()
+    calls = []
+    active = 0
+    peak = 0
+
+    def fake_describe(image_path, prompt):
+        nonlocal active, peak
+        with lock:
+            calls.append(os.path.basename(image_path))
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return f"desc {os.path.basename(image_path)}"
+
+    monkeypatch.setattr(md_desc, "_LLM_CONCURRENCY", 2)
+    monkeypatch.setattr(md_desc, "_describe_image_cached", fake_describe)
+
+    md_desc.process_markdown_image(str(md_file))
+
+    # 重复引用的图片只请求一次，并发数不超过配置值
+    assert sorted(calls) == ["a.png", "b.png", "c.png"]
+    assert peak == 2
+    assert md_file.read_text(encoding="utf-8") == (
+        "![desc a.png](a.png)\n![desc b.png](b.png)\n![desc c.png](c.png)\n"
+        "![desc a.png](a.png)\n![](missing.png)\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("2", 2), ("", 6), ("abc", 6), ("0", 6), ("-3", 6), (None, 6)]
+)
+def test_read_concurrency(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("SMARTPAPER_LLM_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("SMARTPAPER_LLM_CONCURRENCY", value)
+
+    assert md_desc._read_concurrency() == expected
+
+
+def test_process_markdown_image_falls_back_to_exists(tmp_path, monkeypatch):
+    (tmp_path / "a.png").write_bytes(b"a")
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("![](a.png)\n", encoding="utf-8")
+
+    # 模拟大小写不敏感的文件系统：目录列表中的文件名与引用的大小写不一致
+    monkeypatch.setattr(md_desc, "_list_file_names", lambda directory: {"A.PNG"})
+    monkeypatch.setattr(md_desc, "_describe_image_cached", lambda image_path, prompt: "desc")
+
+    md_desc.process_markdown_image(str(md_file))
+
+    assert md_file.read_text(encoding="utf-8") == "![desc](a.png)\n"
+
+
+def test_degenerate_description_retry_reuses_extractor(
+    tmp_path, monkeypatch, isolated_extractor_cache
+):
+    from tools.everything_to_text import image_to_text
+
+    image = tmp_path / "a.png"
+    image.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\0" * 16)
+    prompts = []
+
+    def fake_request(self, request):
+        prompts.append(request["messages"][0]["content"][1]["text"])
+        return "In" if len(prompts) == 1 else "图中是一张折线图，横轴为年份，纵轴为销量。"
+
+    monkeypatch.setenv("API_KEY", "test-key")
+    monkeypatch.setattr(image_to_text.ImageTextExtractor, "_request_text", fake_request)
+    monkeypatch.setattr(md_desc, "_VLM_CACHE_DIR", tmp_path / "cache")
+
+    description = md_desc._describe_image_cached(str(image), "描述图片")
+
+    # 重试使用附带上次输出的提示，但仍复用同一个提取器
+    assert description == "图中是一张折线图，横轴为年份，纵轴为销量。"
+    assert prompts[0] == "描述图片"
+    assert "'In'" in prompts[1]
+    assert isolated_extractor_cache.cache_info().currsize == 1
+
+
+def test_description_cache_key_covers_whole_file(tmp_path, monkeypatch):
+    from tools.everything_to_text import image_to_text
+
+    # 大小相同、开头相同的两张大图不能共用同一条缓存
+    head = b"\x89PNG\r\n\x1a\n" + b"\0" * (2 << 20)
+    first, second = tmp_path / "first.png", tmp_path / "second.png"
+    first.write_bytes(head + b"A")
+    second.write_bytes(head + b"B")
+
+    monkeypatch.setattr(
+        image_to_text,
+        "describe_image",
+        lambda image_path, prompt=None: f"这是图片 {os.path.basename(image_path)} 的描述。",
+    )
+    monkeypatch.setattr(md_desc, "_VLM_CACHE_DIR", tmp_path / "cache")
+
+    assert md_desc._describe_image_cached(str(first), "p") == "这是图片 first.png 的描述。"
+    assert md_desc._describe_image_cached(str(second), "p") == "这是图片 second.png 的描述。"
+    assert len(list((tmp_path / "cache").iterdir())) == 2
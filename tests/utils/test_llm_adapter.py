@@ -0,0 +1,78 @@
+"""
+测试 create_llm_adapter 的客户端复用：相同配置共用ChatOpenAI客户端，
+但每次返回新的适配器，更新密钥互不影响。
+"""
+
+import copy
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("langchain_community")
+pytest.importorskip("zhipuai")
+
+import utils.llm_adapter as llm_adapter
+from utils.llm_adapter import create_llm_adapter
+
+
+@pytest.fixture
+def openai_config():
+    return {
+        "provider": "openai",
+        "openai": {
+            "api_key": "key-a",
+            "model": "gpt-4o-mini",
+            "temperature": 0.7,
+            "max_tokens": 2000,
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def fake_chat_openai(monkeypatch):
+    monkeypatch.setattr(llm_adapter, "ChatOpenAI", MagicMock(side_effect=lambda **kw: object()))
+    monkeypatch.setattr(llm_adapter, "_CLIENT_CACHE", type(llm_adapter._CLIENT_CACHE)())
+
+
+def test_same_config_shares_client_not_adapter(openai_config):
+    first = create_llm_adapter(openai_config)
+    second = create_llm_adapter(copy.deepcopy(openai_config))
+
+    assert first is not second
+    assert first.client is second.client
+
+
+def test_update_api_key_does_not_affect_other_adapters(openai_config):
+    other_config = copy.deepcopy(openai_config)
+    first = create_llm_adapter(openai_config)
+    second = create_llm_adapter(other_config)
+    shared_client = second.client
+
+    first.update_api_key("key-b")
+
+    assert first.client is not shared_client
+    assert second.client is shared_client
+    assert other_config["openai"]["api_key"] == "key-a"
+
+
+def test_zhipu_key_is_set_on_every_create(monkeypatch):
+    fake_zhipuai = types.SimpleNamespace(api_key=None)
+    monkeypatch.setattr(llm_adapter, "zhipuai", fake_zhipuai)
+
+    def zhipu_config(api_key):
+        return {
+            "provider": "zhipuai",
+            "zhipuai": {
+                "api_key": api_key,
+                "model": "glm-4",
+                "temperature": 0.7,
+                "max_tokens": 2000,
+            },
+        }
+
+    create_llm_adapter(zhipu_config("key-a"))
+    create_llm_adapter(zhipu_config("key-b"))
+    create_llm_adapter(zhipu_config("key-a"))
+
+    assert fake_zhipuai.api_key == "key-a"